@@ -8,6 +8,7 @@ from alembic import context
 # Import your models and config
 from app.config import settings
 from app.db.base import Base
+from app.models.customer import Customer
 from app.models.invoice import Invoice
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,63 @@
+"""native status enum and open invoice partial indexes
+
+Revision ID: 3b7d2a9c41e5
+Revises: efbcf87cd36a
+Create Date: 2026-10-19 09:12:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2a9c41e5'
+down_revision: Union[str, None] = 'efbcf87cd36a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+invoice_status = postgresql.ENUM(
+    'pending', 'paid', 'cancelled', 'overdue', name='invoice_status', create_type=False
+)
+
+
+def upgrade() -> None:
+    invoice_status.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        'invoices',
+        'status',
+        existing_type=sa.String(length=50),
+        type_=invoice_status,
+        existing_nullable=False,
+        postgresql_using='status::invoice_status',
+    )
+    op.create_index(
+        'ix_invoices_pending_created_at',
+        'invoices',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        'ix_invoices_overdue_created_at',
+        'invoices',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'overdue'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_overdue_created_at', table_name='invoices')
+    op.drop_index('ix_invoices_pending_created_at', table_name='invoices')
+    op.alter_column(
+        'invoices',
+        'status',
+        existing_type=invoice_status,
+        type_=sa.String(length=50),
+        existing_nullable=False,
+        postgresql_using='status::text',
+    )
+    invoice_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,95 @@
+"""normalize customers into their own table
+
+Revision ID: 8f14c6d2e0a7
+Revises: 3b7d2a9c41e5
+Create Date: 2026-10-19 10:05:12.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f14c6d2e0a7'
+down_revision: Union[str, None] = '3b7d2a9c41e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Invoice id range backfilled per transaction
+BACKFILL_BATCH_SIZE = 10000
+
+# SQL twin of app.models.customer.normalize_customer_name: collapse runs of the same
+# ASCII whitespace set to one space first, trim the remaining edge spaces, then lowercase
+# ASCII letters only (lower() depends on the collation and differs from Python on non-ASCII)
+NORMALIZED_CUSTOMER = (
+    "translate(btrim(regexp_replace(invoices.customer, '[ \\t\\n\\r\\f\\v]+', ' ', 'g')), "
+    "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+)
+
+
+def upgrade() -> None:
+    op.create_table('customers',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('normalized_name', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('normalized_name')
+    )
+    # First spelling seen for each customer becomes its display name
+    op.execute(
+        f"""
+        INSERT INTO customers (name, normalized_name, created_at)
+        SELECT DISTINCT ON ({NORMALIZED_CUSTOMER})
+            btrim(invoices.customer), {NORMALIZED_CUSTOMER}, invoices.created_at
+        FROM invoices
+        ORDER BY {NORMALIZED_CUSTOMER}, invoices.created_at
+        """
+    )
+    op.add_column('invoices', sa.Column('customer_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'invoices_customer_id_fkey', 'invoices', 'customers', ['customer_id'], ['id']
+    )
+
+    backfill = f"""
+        UPDATE invoices SET customer_id = customers.id
+        FROM customers
+        WHERE invoices.customer_id IS NULL
+            AND customers.normalized_name = {NORMALIZED_CUSTOMER}
+    """
+    if op.get_context().as_sql:
+        op.execute(backfill)
+    else:
+        # Backfill by primary key range, committing each batch so row locks stay short
+        with op.get_context().autocommit_block():
+            bind = op.get_bind()
+            max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM invoices")).scalar_one()
+            for start in range(1, max_id + 1, BACKFILL_BATCH_SIZE):
+                bind.execute(
+                    sa.text(f"{backfill} AND invoices.id >= :start AND invoices.id < :stop"),
+                    {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+                )
+
+    op.alter_column('invoices', 'customer_id', existing_type=sa.Integer(), nullable=False)
+    op.create_index(
+        'ix_invoices_customer_id_created_at',
+        'invoices',
+        ['customer_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.drop_column('invoices', 'customer')
+
+
+def downgrade() -> None:
+    op.add_column('invoices', sa.Column('customer', sa.String(length=255), nullable=True))
+    op.execute(
+        "UPDATE invoices SET customer = customers.name "
+        "FROM customers WHERE customers.id = invoices.customer_id"
+    )
+    op.alter_column('invoices', 'customer', existing_type=sa.String(length=255), nullable=False)
+    op.drop_index('ix_invoices_customer_id_created_at', table_name='invoices')
+    op.drop_constraint('invoices_customer_id_fkey', 'invoices', type_='foreignkey')
+    op.drop_column('invoices', 'customer_id')
+    op.drop_table('customers')
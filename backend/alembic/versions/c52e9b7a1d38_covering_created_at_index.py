@@ -0,0 +1,32 @@
+"""covering created_at index for sparse invoice lists
+
+Revision ID: c52e9b7a1d38
+Revises: 8f14c6d2e0a7
+Create Date: 2026-10-19 12:10:27.553019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e9b7a1d38'
+down_revision: Union[str, None] = '8f14c6d2e0a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_invoices_created_at_covering',
+        'invoices',
+        [sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=['id', 'amount', 'status'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_created_at_covering', table_name='invoices')
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.exceptions import CustomerNotFoundError, DatabaseError
+from app.logging_config import get_logger
+from app.models.customer import Customer
+from app.models.invoice import Invoice
+from app.schemas.invoice import InvoiceResponse
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.get("/{customer_id}/invoices", response_model=list[InvoiceResponse])
+async def get_customer_invoices(
+    customer_id: int,
+    limit: int = Query(default=50, ge=1, le=500, description="Maximum invoices to return"),
+    offset: int = Query(default=0, ge=0, description="Invoices to skip"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Retrieve one page of a customer's invoices.
+
+    Served by the `(customer_id, created_at DESC)` index, so the cost depends
+    on the page size rather than the size of the invoices table.
+
+    Args:
+        customer_id: Customer to list invoices for
+        limit: Page size
+        offset: Page start
+
+    Returns:
+        Invoices ordered by creation date (newest first)
+
+    Raises:
+        CustomerNotFoundError: If the customer does not exist
+        DatabaseError: If database operation fails
+    """
+    try:
+        logger.info(
+            f"Fetching invoices for customer {customer_id} (limit={limit}, offset={offset})"
+        )
+        result = await db.execute(
+            select(Invoice)
+            .where(Invoice.customer_id == customer_id)
+            .order_by(Invoice.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        invoices = result.scalars().all()
+
+        # An empty page is the only case where the customer might not exist
+        if not invoices and await db.get(Customer, customer_id) is None:
+            raise CustomerNotFoundError(customer_id)
+
+        logger.info(f"Successfully fetched {len(invoices)} invoices for customer {customer_id}")
+        return invoices
+    except CustomerNotFoundError:
+        raise
+    except SQLAlchemyError as e:
+        logger.error(f"Database error while fetching customer invoices: {str(e)}", exc_info=True)
+        raise DatabaseError("Failed to fetch customer invoices")
+    except Exception as e:
+        logger.error(f"Unexpected error while fetching customer invoices: {str(e)}", exc_info=True)
+        raise DatabaseError("Internal server error")
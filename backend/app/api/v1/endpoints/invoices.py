@@ -1,32 +1,144 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import ColumnElement, Integer, Row, Select, bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.db.customer_lookup import customer_lookup
 from app.db.session import get_db
-from app.exceptions import DatabaseError, InvoiceDuplicateError
+from app.exceptions import (
+    AppError,
+    DatabaseError,
+    InvoiceDuplicateError,
+    InvoiceNotFoundError,
+    InvoiceValidationError,
+)
 from app.logging_config import get_logger
-from app.models.invoice import Invoice
-from app.schemas.invoice import InvoiceCreate, InvoiceResponse
+from app.models.customer import Customer, normalize_customer_name
+from app.models.invoice import ALLOWED_STATUS_SOURCES, Invoice, InvoiceStatus
+from app.schemas.invoice import (
+    InvoiceBulkStatusResponse,
+    InvoiceBulkStatusUpdate,
+    InvoiceCreate,
+    InvoiceResponse,
+    InvoiceStatusFilter,
+    InvoiceStatusUpdateError,
+)
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# InvoiceResponse fields as SQL columns; also the allow-list for `fields=`.
+# Only "customer" needs the customers join.
+INVOICE_RESPONSE_COLUMNS = {
+    "id": Invoice.id,
+    "customer_id": Invoice.customer_id,
+    "customer": Customer.name.label("customer"),
+    "amount": Invoice.amount,
+    "status": Invoice.status,
+    "created_at": Invoice.created_at,
+    "updated_at": Invoice.updated_at,
+}
+
+# Serializes projected rows the same way InvoiceResponse would, without building models
+_invoice_rows_adapter = TypeAdapter(list[dict[str, Any]])
 
-@router.get("/", response_model=list[InvoiceResponse])
-async def get_invoices(db: AsyncSession = Depends(get_db)):
+
+def _parse_fields(fields: str) -> list[str]:
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    invalid = [field for field in requested if field not in INVOICE_RESPONSE_COLUMNS]
+    if not requested or invalid:
+        raise InvoiceValidationError(
+            "Invalid fields requested",
+            details={"invalid_fields": invalid, "allowed_fields": list(INVOICE_RESPONSE_COLUMNS)},
+        )
+    return requested
+
+
+@router.get(
+    "/",
+    response_model=list[InvoiceResponse],
+    responses={
+        200: {
+            "description": (
+                "Invoices, newest first. With `fields`, each object contains only the "
+                "requested fields instead of the full InvoiceResponse."
+            ),
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "sparse": {
+                            "summary": "fields=id,status,amount",
+                            "value": [{"id": 1, "status": "pending", "amount": "100.00"}],
+                        }
+                    }
+                }
+            },
+        }
+    },
+)
+async def get_invoices(
+    status: InvoiceStatus | None = Query(default=None, description="Only return this status"),
+    fields: str | None = Query(
+        default=None,
+        description=f"Comma-separated subset of: {', '.join(INVOICE_RESPONSE_COLUMNS)}",
+    ),
+    db: AsyncSession = Depends(get_db),
+):
     """
-    Retrieve all invoices from the database.
+    Retrieve invoices from the database.
+
+    Filtering on an open status (pending/overdue) is served by the partial
+    indexes on `created_at` for that status.
+
+    With `fields`, only those columns are selected and serialized, and each
+    returned object contains just those fields. Subsets of
+    id/amount/status/created_at can be served by an index-only scan of the
+    covering `created_at` index; whether the planner uses it depends on the
+    visibility map and the other filters (with `status`, the partial index
+    for that status is likely chosen instead).
+
+    Args:
+        status: Optional status filter
+        fields: Optional comma-separated list of fields to return
 
     Returns:
         List of invoices ordered by creation date (newest first)
 
     Raises:
+        InvoiceValidationError: If `fields` names an unknown field
         DatabaseError: If database operation fails
     """
+    requested_fields = _parse_fields(fields) if fields is not None else None
+
     try:
-        logger.info("Fetching all invoices")
-        result = await db.execute(select(Invoice).order_by(Invoice.created_at.desc()))
+        logger.info(
+            f"Fetching invoices (status={status.value if status else 'all'}, "
+            f"fields={','.join(requested_fields) if requested_fields else 'all'})"
+        )
+        query: Select
+        if requested_fields is not None:
+            query = select(*(INVOICE_RESPONSE_COLUMNS[field] for field in requested_fields))
+            query = query.select_from(Invoice)
+            if "customer" in requested_fields:
+                query = query.join(Invoice.customer)
+        else:
+            query = select(Invoice)
+        if status is not None:
+            query = query.where(Invoice.status == status)
+        result = await db.execute(query.order_by(Invoice.created_at.desc()))
+
+        if requested_fields is not None:
+            rows = [row._asdict() for row in result]
+            logger.info(f"Successfully fetched {len(rows)} invoices")
+            return Response(
+                content=_invoice_rows_adapter.dump_json(rows), media_type="application/json"
+            )
+
         invoices = result.scalars().all()
         logger.info(f"Successfully fetched {len(invoices)} invoices")
         return invoices
@@ -56,13 +168,11 @@ async def create_invoice(invoice: InvoiceCreate, db: AsyncSession = Depends(get_
     try:
         logger.info(f"Creating invoice for customer: {invoice.customer}")
 
-        db_invoice = Invoice(
-            customer=invoice.customer,
-            amount=invoice.amount,
-            status=invoice.status,
-        )
+        customer_id = await customer_lookup.resolve(db, invoice.customer)
+        db_invoice = Invoice(customer_id=customer_id, amount=invoice.amount, status=invoice.status)
         db.add(db_invoice)
         await db.commit()
+        customer_lookup.remember(invoice.customer, customer_id)
         await db.refresh(db_invoice)
 
         logger.info(f"Successfully created invoice with ID: {db_invoice.id}")
@@ -80,3 +190,163 @@ async def create_invoice(invoice: InvoiceCreate, db: AsyncSession = Depends(get_
         await db.rollback()
         logger.error(f"Unexpected error while creating invoice: {str(e)}", exc_info=True)
         raise DatabaseError("Internal server error")
+
+
+def _status_update_error(invoice_id: int, exc: AppError) -> InvoiceStatusUpdateError:
+    return InvoiceStatusUpdateError(
+        invoice_id=invoice_id,
+        error=exc.message,
+        status_code=exc.status_code,
+        details=exc.details,
+    )
+
+
+async def _update_status_by_ids(
+    db: AsyncSession, ids: list[int], target: InvoiceStatus
+) -> tuple[list[Row], list[InvoiceStatusUpdateError]]:
+    """Update `ids` in chunks, one `UPDATE ... WHERE id = ANY(:ids)` per chunk."""
+    sources = ALLOWED_STATUS_SOURCES[target]
+    chunk_ids = bindparam("chunk_ids", type_=ARRAY(Integer))
+    update_stmt = (
+        update(Invoice)
+        .where(
+            Invoice.customer_id == Customer.id,
+            Invoice.id == func.any(chunk_ids),
+            Invoice.status.in_(sources),
+        )
+        .values(status=target, updated_at=func.now())
+        .returning(*INVOICE_RESPONSE_COLUMNS.values())
+        .execution_options(synchronize_session=False)
+    )
+    updated: list[Row] = []
+    errors: list[InvoiceStatusUpdateError] = []
+    chunk_size = settings.BULK_STATUS_CHUNK_SIZE
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        result = await db.execute(update_stmt, {"chunk_ids": chunk})
+        chunk_updated = list(result.all())
+        updated.extend(chunk_updated)
+
+        updated_ids = {row.id for row in chunk_updated}
+        skipped = [invoice_id for invoice_id in chunk if invoice_id not in updated_ids]
+        if not skipped:
+            continue
+
+        # Only failed ids cost an extra round trip, to tell missing from disallowed
+        status_result = await db.execute(
+            select(Invoice.id, Invoice.status).where(Invoice.id == func.any(chunk_ids)),
+            {"chunk_ids": skipped},
+        )
+        current_statuses: dict[int, InvoiceStatus] = dict(status_result.tuples().all())
+        for invoice_id in skipped:
+            current = current_statuses.get(invoice_id)
+            if current is None:
+                exc: AppError = InvoiceNotFoundError(invoice_id)
+            else:
+                exc = InvoiceValidationError(
+                    f"Cannot change invoice status from {current.value} to {target.value}",
+                    details={
+                        "invoice_id": invoice_id,
+                        "current_status": current.value,
+                        "target_status": target.value,
+                    },
+                )
+            errors.append(_status_update_error(invoice_id, exc))
+
+    return updated, errors
+
+
+async def _update_status_by_filter(
+    db: AsyncSession, invoice_filter: InvoiceStatusFilter, target: InvoiceStatus
+) -> list[Row]:
+    """Update every invoice matching `invoice_filter`, at most one chunk per statement."""
+    conditions: list[ColumnElement[bool]] = [Invoice.status.in_(ALLOWED_STATUS_SOURCES[target])]
+    if invoice_filter.status is not None:
+        conditions.append(Invoice.status == invoice_filter.status)
+    if invoice_filter.customer is not None:
+        customer_id = select(Customer.id).where(
+            Customer.normalized_name == normalize_customer_name(invoice_filter.customer)
+        )
+        conditions.append(Invoice.customer_id == customer_id.scalar_subquery())
+    if invoice_filter.created_before is not None:
+        conditions.append(Invoice.created_at < invoice_filter.created_before)
+
+    chunk_size = settings.BULK_STATUS_CHUNK_SIZE
+    matching_ids = select(Invoice.id).where(*conditions).order_by(Invoice.id).limit(chunk_size)
+    update_stmt = (
+        update(Invoice)
+        # The filter is repeated outside the subquery: under READ COMMITTED Postgres only
+        # rechecks the outer WHERE against rows changed concurrently, so a row another
+        # transaction just made paid or cancelled is skipped instead of overwritten
+        .where(
+            Invoice.customer_id == Customer.id,
+            Invoice.id.in_(matching_ids),
+            *conditions,
+        )
+        .values(status=target, updated_at=func.now())
+        .returning(*INVOICE_RESPONSE_COLUMNS.values())
+        .execution_options(synchronize_session=False)
+    )
+    updated: list[Row] = []
+    # Updated rows leave the allowed source statuses, so each pass picks up new ones. A short
+    # pass can just mean the outer WHERE skipped rows changed concurrently (which then no
+    # longer match the subquery either), so only an empty pass means everything is done
+    while True:
+        result = await db.execute(update_stmt)
+        chunk_updated = list(result.all())
+        if not chunk_updated:
+            return updated
+        updated.extend(chunk_updated)
+
+
+@router.patch("/status", response_model=InvoiceBulkStatusResponse)
+async def update_invoice_statuses(
+    payload: InvoiceBulkStatusUpdate, db: AsyncSession = Depends(get_db)
+):
+    """
+    Change the status of many invoices in one request.
+
+    Invoices are selected either by `ids` or by `filter` and updated with
+    set-based statements, one round trip per chunk of BULK_STATUS_CHUNK_SIZE.
+    Ids that do not exist or whose current status cannot move to the target
+    are reported per id instead of failing the whole request.
+
+    Args:
+        payload: Invoice selection and target status
+
+    Returns:
+        Updated invoices and per-id errors
+
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    try:
+        logger.info(f"Bulk status change to {payload.status.value}")
+
+        if payload.ids is not None:
+            unique_ids = list(dict.fromkeys(payload.ids))
+            updated, errors = await _update_status_by_ids(db, unique_ids, payload.status)
+        else:
+            assert payload.filter is not None
+            updated = await _update_status_by_filter(db, payload.filter, payload.status)
+            errors = []
+        await db.commit()
+
+        logger.info(
+            f"Bulk status change to {payload.status.value}: "
+            f"{len(updated)} updated, {len(errors)} failed"
+        )
+        return InvoiceBulkStatusResponse(
+            updated=[InvoiceResponse.model_validate(row) for row in updated],
+            errors=errors,
+        )
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Database error while updating invoice statuses: {str(e)}", exc_info=True)
+        raise DatabaseError("Failed to update invoice statuses")
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Unexpected error while updating invoice statuses: {str(e)}", exc_info=True)
+        raise DatabaseError("Internal server error")
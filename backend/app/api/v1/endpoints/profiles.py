@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import FileResponse
+
+from app.exceptions import ProfileNotFoundError, ProfilingForbiddenError
+from app.middleware.profiling import is_authorized, profile_store
+
+
+async def require_profiling_token(x_profile_token: str | None = Header(default=None)) -> None:
+    """Allow access only with the same token that turns profiling on"""
+    if not is_authorized(x_profile_token):
+        raise ProfilingForbiddenError()
+
+
+router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+
+@router.get("/")
+async def list_profiles() -> list[dict[str, Any]]:
+    """
+    List stored request profiles, newest first.
+
+    Returns:
+        Profile summaries without function or SQL details
+    """
+    return await asyncio.to_thread(profile_store.recent)
+
+
+@router.get("/{request_id}")
+async def get_profile(request_id: str) -> dict[str, Any]:
+    """
+    Retrieve the profile of one request.
+
+    Args:
+        request_id: X-Request-ID of the profiled request
+
+    Returns:
+        Request summary, SQL statements with timings and the slowest functions
+
+    Raises:
+        ProfileNotFoundError: If no profile is stored for the request
+    """
+    profile = await asyncio.to_thread(profile_store.load, request_id)
+    if profile is None:
+        raise ProfileNotFoundError(request_id)
+    return profile
+
+
+@router.get("/{request_id}/pstats")
+async def download_profile_stats(request_id: str) -> FileResponse:
+    """
+    Download the raw cProfile dump of one request, for pstats or snakeviz.
+
+    Raises:
+        ProfileNotFoundError: If no profile is stored for the request
+    """
+    path = await asyncio.to_thread(profile_store.stats_path, request_id)
+    if path is None:
+        raise ProfileNotFoundError(request_id)
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
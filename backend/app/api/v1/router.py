@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import health, invoices
+from app.api.v1.endpoints import customers, health, invoices, profiles
 
 api_router = APIRouter()
 
 api_router.include_router(health.router, tags=["health"])
 api_router.include_router(invoices.router, prefix="/invoices", tags=["invoices"])
+api_router.include_router(customers.router, prefix="/customers", tags=["customers"])
+api_router.include_router(profiles.router, prefix="/internal/profiles", tags=["internal"])
@@ -16,6 +16,34 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5433
 
+    # Overdue sweeper - moves pending invoices older than OVERDUE_AFTER_DAYS to overdue
+    OVERDUE_AFTER_DAYS: int = 30
+    OVERDUE_SWEEP_BATCH_SIZE: int = 500
+    OVERDUE_SWEEP_INTERVAL_SECONDS: int = 300
+    # Run the sweeper inside the API process; leave off when using the standalone worker
+    OVERDUE_SWEEPER_ENABLED: bool = False
+
+    # Max invoice ids per UPDATE statement in bulk status changes
+    BULK_STATUS_CHUNK_SIZE: int = 1000
+
+    # Customer name -> id entries kept in memory for the invoice create path
+    CUSTOMER_CACHE_SIZE: int = 10000
+
+    # Response compression - br/zstd need the optional "compression" extra
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_EXCLUDED_PATHS: list[str] = ["/api/v1/health"]
+
+    # Per-request profiling - on for requests sending X-Profile-Token: <PROFILING_TOKEN>,
+    # plus a random PROFILING_SAMPLE_RATE fraction of all requests
+    PROFILING_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = str(Path(__file__).resolve().parent.parent / "profiles")
+    PROFILING_MAX_PROFILES: int = 100
+
     CORS_ORIGINS: list[str] = [
         "http://localhost:8080",
         "http://localhost:5173",
@@ -0,0 +1,54 @@
+"""Cached customer name -> id resolution for the invoice create path."""
+
+from collections import OrderedDict
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.customer import Customer, normalize_customer_name
+
+
+class CustomerLookup:
+    """
+    Process-local LRU cache of normalized customer name -> customer id.
+
+    A hit costs no database round trip. A miss upserts the customer in the
+    caller's transaction and returns its id in a single statement. That id is
+    only cached once the caller has committed and calls `remember`, so a
+    rolled back or cancelled transaction can never leave a dangling id behind.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._ids: OrderedDict[str, int] = OrderedDict()
+
+    async def resolve(self, db: AsyncSession, name: str) -> int:
+        normalized_name = normalize_customer_name(name)
+        cached_id = self._ids.get(normalized_name)
+        if cached_id is not None:
+            self._ids.move_to_end(normalized_name)
+            return cached_id
+
+        insert_stmt = insert(Customer).values(name=name.strip(), normalized_name=normalized_name)
+        # No-op update so RETURNING also yields the id of an existing customer
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Customer.normalized_name],
+            set_={"normalized_name": insert_stmt.excluded.normalized_name},
+        ).returning(Customer.id)
+        customer_id: int = (await db.execute(upsert_stmt)).scalar_one()
+        return customer_id
+
+    def remember(self, name: str, customer_id: int) -> None:
+        """Cache `customer_id` for `name`; call only after its row is committed."""
+        normalized_name = normalize_customer_name(name)
+        self._ids[normalized_name] = customer_id
+        self._ids.move_to_end(normalized_name)
+        if len(self._ids) > self.maxsize:
+            self._ids.popitem(last=False)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+
+customer_lookup = CustomerLookup(maxsize=settings.CUSTOMER_CACHE_SIZE)
@@ -40,6 +40,32 @@ class InvoiceValidationError(AppError):
         )
 
 
+class CustomerNotFoundError(AppError):
+    def __init__(self, customer_id: int):
+        super().__init__(
+            message="Customer not found",
+            status_code=404,
+            details={"customer_id": customer_id},
+        )
+
+
+class ProfileNotFoundError(AppError):
+    def __init__(self, request_id: str):
+        super().__init__(
+            message="Profile not found",
+            status_code=404,
+            details={"request_id": request_id},
+        )
+
+
+class ProfilingForbiddenError(AppError):
+    def __init__(self):
+        super().__init__(
+            message="Invalid or missing profiling token",
+            status_code=403,
+        )
+
+
 class DatabaseError(AppError):
     def __init__(self, message: str = "Database operation failed"):
         super().__init__(
@@ -1,3 +1,6 @@
+import asyncio
+import contextlib
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
@@ -6,7 +9,10 @@ from app.config import settings
 from app.exception_handlers import app_exception_handler, general_exception_handler
 from app.exceptions import AppError
 from app.logging_config import get_logger, setup_logging
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.logging import RequestLoggingMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.workers.overdue_sweeper import run_overdue_sweeper
 
 setup_logging()
 logger = get_logger(__name__)
@@ -23,19 +29,40 @@ app.add_exception_handler(AppError, app_exception_handler)  # type: ignore[arg-t
 # Safety net for any unhandled exceptions
 app.add_exception_handler(Exception, general_exception_handler)
 
+# Added before the logging middleware so it runs inside it and sees the request id
+if settings.PROFILING_TOKEN or settings.PROFILING_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        excluded_prefixes=("/api/v1/internal/profiles",),
+    )
+
 app.add_middleware(RequestLoggingMiddleware)
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_level=settings.COMPRESSION_BROTLI_LEVEL,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+        excluded_paths=settings.COMPRESSION_EXCLUDED_PATHS,
+    )
+
 # CORS Configuration - Allow frontend to communicate with backend
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["Content-Type", "Authorization", "X-Request-ID"],
+    allow_headers=["Content-Type", "Authorization", "X-Request-ID", "X-Profile-Token"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
 
+# Handle to the in-process overdue sweeper, when OVERDUE_SWEEPER_ENABLED is set
+overdue_sweeper_task: asyncio.Task[None] | None = None
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -45,11 +72,20 @@ async def startup_event():
         f"Database: {settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
     )
 
+    global overdue_sweeper_task
+    if settings.OVERDUE_SWEEPER_ENABLED:
+        overdue_sweeper_task = asyncio.create_task(run_overdue_sweeper())
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Invoice Service API")
 
+    if overdue_sweeper_task is not None:
+        overdue_sweeper_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await overdue_sweeper_task
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,228 @@
+"""Negotiated response compression middleware.
+
+gzip is always available; brotli (`br`) and zstd are offered when the optional
+`brotli` / `zstandard` packages are installed (`pip install ".[compression]"`).
+
+Implemented as plain ASGI rather than BaseHTTPMiddleware so streaming responses
+are compressed chunk by chunk and flushed as they go instead of being buffered.
+"""
+
+import zlib
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compress `data` and flush, so the output can be sent on its own."""
+
+    def finish(self) -> bytes:
+        """Return the end of the compressed stream."""
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        compressed: bytes = self._compressor.process(data) + self._compressor.flush()
+        return compressed
+
+    def finish(self) -> bytes:
+        compressed: bytes = self._compressor.finish()
+        return compressed
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> list[str]:
+    """Supported encodings, in server preference order (least CPU per byte saved first)."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, encodings: list[str]) -> str | None:
+    """
+    Pick the encoding to use for an `Accept-Encoding` header value.
+
+    The highest client q-value wins; ties go to the earlier entry in
+    `encodings`. Returns None when the client accepts none of them.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        param_name, _, param_value = params.strip().partition("=")
+        if param_name.strip().lower() == "q":
+            try:
+                q = float(param_value)
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best encoding the client accepts.
+
+    Responses smaller than `minimum_size`, responses that already carry a
+    Content-Encoding, non-compressible content types and `excluded_paths`
+    are passed through untouched.
+    """
+
+    COMPRESSIBLE_TYPES = (
+        "application/json",
+        "application/x-ndjson",
+        "application/javascript",
+        "text/",
+    )
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_level: int = 4,
+        zstd_level: int = 3,
+        excluded_paths: list[str] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_level, "zstd": zstd_level}
+        self.excluded_paths = set(excluded_paths or [])
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.levels[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+def new_compressor(encoding: str, level: int) -> Compressor:
+    if encoding == "br":
+        return BrotliCompressor(level)
+    if encoding == "zstd":
+        return ZstdCompressor(level)
+    return GzipCompressor(level)
+
+
+class _CompressionResponder:
+    """Wraps `send` for one response, deciding on the first body chunk whether to compress."""
+
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or not content_type.startswith(
+                CompressionMiddleware.COMPRESSIBLE_TYPES
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                # Held back until the first body chunk shows whether compression pays off
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._send(start_message)
+                await self._send(message)
+                return
+
+            self.compressor = new_compressor(self.encoding, self.level)
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                # Final size is unknown while streaming
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(start_message)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(start_message)
+
+        assert self.compressor is not None
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,278 @@
+"""Opt-in per-request profiling.
+
+A request is profiled when it carries `X-Profile-Token` matching
+PROFILING_TOKEN, or when it is picked by PROFILING_SAMPLE_RATE. Its cProfile
+stats and the SQL statements it ran (with timings) are written to a bounded
+on-disk ring buffer keyed by the request's X-Request-ID, and served by the
+internal profiles endpoints.
+
+When no request is being profiled the only costs are one header lookup per
+request and one ContextVar read per SQL statement. The middleware is not
+installed at all while profiling is disabled.
+
+cProfile traces the whole event-loop thread, so a profile also contains any
+other requests that were running concurrently. Only one request is profiled
+at a time; other requests picked while one is running are not profiled.
+"""
+
+import asyncio
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_TOKEN_HEADER = "x-profile-token"
+
+# Functions kept in the stored summary, by cumulative time
+TOP_FUNCTIONS = 50
+
+# SQL statements of the request being profiled; None when it is not profiled
+_profiled_queries: ContextVar[list[dict[str, Any]] | None] = ContextVar(
+    "profiled_queries", default=None
+)
+_profiler_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _profiled_queries.get() is not None:
+        context._profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    queries = _profiled_queries.get()
+    started = getattr(context, "_profiling_started", None)
+    if queries is None or started is None:
+        return
+    # Parameters are left out on purpose: they can contain customer data
+    queries.append(
+        {
+            "statement": statement,
+            "executemany": executemany,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+    )
+
+
+def is_authorized(token: str | None) -> bool:
+    """Check a client-supplied token against PROFILING_TOKEN (never matches when unset)."""
+    if not settings.PROFILING_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode(), settings.PROFILING_TOKEN.encode())
+
+
+class ProfileStore:
+    """
+    Ring buffer of request profiles on disk.
+
+    Each profile is a `<request_id>.json` summary next to the raw
+    `<request_id>.prof` cProfile dump; once more than `max_profiles` are
+    stored, the oldest are deleted.
+
+    Files are written to a temporary name and renamed into place, so readers
+    never see a partial file, and files deleted by a concurrent eviction (from
+    another thread or worker process) are skipped rather than failing.
+    """
+
+    def __init__(self, directory: Path, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def _path(self, request_id: str, suffix: str) -> Path | None:
+        # Request ids are UUIDs; anything else must not reach the filesystem
+        try:
+            uuid.UUID(request_id)
+        except ValueError:
+            return None
+        return self.directory / f"{request_id}{suffix}"
+
+    def save(self, request_id: str, profiler: cProfile.Profile, summary: dict[str, Any]) -> None:
+        summary_path = self._path(request_id, ".json")
+        stats_path = self._path(request_id, ".prof")
+        if summary_path is None or stats_path is None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stats_tmp_path = stats_path.with_name(f"{stats_path.name}.tmp")
+        profiler.dump_stats(stats_tmp_path)
+        os.replace(stats_tmp_path, stats_path)
+
+        entries = pstats.Stats(profiler).stats.items()  # type: ignore[attr-defined]
+        top = sorted(entries, key=lambda item: item[1][3], reverse=True)
+        summary["functions"] = [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in top[:TOP_FUNCTIONS]
+        ]
+        summary_tmp_path = summary_path.with_name(f"{summary_path.name}.tmp")
+        summary_tmp_path.write_text(json.dumps(summary))
+        # Filesystem timestamps can be coarser than the gap between two saves
+        saved_at = time.time_ns()
+        os.utime(summary_tmp_path, ns=(saved_at, saved_at))
+        os.replace(summary_tmp_path, summary_path)
+        self._evict()
+
+    def _summaries(self) -> list[Path]:
+        """Stored summaries, oldest first."""
+        saved: list[tuple[int, Path]] = []
+        for path in self.directory.glob("*.json"):
+            try:
+                saved.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                continue  # evicted since the glob
+        return [path for _, path in sorted(saved)]
+
+    def _evict(self) -> None:
+        summaries = self._summaries()
+        for path in summaries[: max(len(summaries) - self.max_profiles, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".prof").unlink(missing_ok=True)
+
+    def load(self, request_id: str) -> dict[str, Any] | None:
+        path = self._path(request_id, ".json")
+        if path is None:
+            return None
+        try:
+            profile: dict[str, Any] = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        return profile
+
+    def stats_path(self, request_id: str) -> Path | None:
+        path = self._path(request_id, ".prof")
+        if path is None or not path.is_file():
+            return None
+        return path
+
+    def recent(self) -> list[dict[str, Any]]:
+        """Stored profiles, newest first, without the function and SQL details."""
+        if not self.directory.is_dir():
+            return []
+        profiles = []
+        for path in reversed(self._summaries()):
+            try:
+                summary = json.loads(path.read_text())
+            except FileNotFoundError:
+                continue  # evicted since it was listed
+            summary["query_count"] = len(summary.pop("queries"))
+            summary.pop("functions")
+            profiles.append(summary)
+        return profiles
+
+
+profile_store = ProfileStore(Path(settings.PROFILING_DIR), settings.PROFILING_MAX_PROFILES)
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that carry a valid profiling token or are sampled.
+
+    Must run inside RequestLoggingMiddleware, which assigns the request id
+    the profile is stored under.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore = profile_store,
+        sample_rate: float = 0.0,
+        excluded_prefixes: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.excluded_prefixes = excluded_prefixes
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if scope["path"].startswith(self.excluded_prefixes):
+            return False
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        token = Headers(scope=scope).get(PROFILE_TOKEN_HEADER)
+        return token is not None and is_authorized(token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _profiler_lock.acquire(blocking=False):
+            logger.info(f"Profiling skipped, another profile is running - Path: {scope['path']}")
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            _profiler_lock.release()
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        queries: list[dict[str, Any]] = []
+        queries_token = _profiled_queries.set(queries)
+        profiler = cProfile.Profile()
+        started_at = datetime.now(UTC)
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start_time
+            _profiled_queries.reset(queries_token)
+
+            request_id = scope.get("state", {}).get("request_id")
+            if request_id is None:
+                logger.warning("Profiled request has no request id, profile discarded")
+            else:
+                summary = {
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "started_at": started_at.isoformat(),
+                    "duration_ms": round(duration * 1000, 3),
+                    "queries": queries,
+                }
+                # No return in here: it would swallow an exception raised by the app
+                try:
+                    await asyncio.to_thread(self.store.save, request_id, profiler, summary)
+                except OSError as e:
+                    logger.error(f"Failed to store profile {request_id}: {str(e)}", exc_info=True)
+                else:
+                    logger.info(
+                        f"Request profiled - ID: {request_id} | "
+                        f"Queries: {len(queries)} | "
+                        f"Duration: {duration:.3f}s"
+                    )
@@ -0,0 +1,42 @@
+import re
+import string
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, String
+from sqlalchemy.orm import Mapped, mapped_column, validates
+
+from app.db.base import Base
+
+# Explicit ASCII whitespace set: str.split() and the Postgres `\s` class disagree on
+# characters such as NBSP, and the backfill migration must normalize identically
+_WHITESPACE_RUN = re.compile(r"[ \t\n\r\f\v]+")
+# ASCII-only case folding, like SQL translate(): str.lower() and Postgres lower() disagree
+# on non-ASCII text (and lower() depends on the collation), and str.lower() can lengthen it
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def normalize_customer_name(name: str) -> str:
+    """Collapse whitespace and case so "ACME  Corp" and "acme corp" are one customer.
+
+    Must stay in sync with the SQL expression used by the customers backfill migration.
+    """
+    return _WHITESPACE_RUN.sub(" ", name).strip(" ").translate(_ASCII_LOWER)
+
+
+class Customer(Base):
+    __tablename__ = "customers"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    normalized_name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
+    )
+
+    @validates("name")
+    def _set_normalized_name(self, key: str, name: str) -> str:
+        self.normalized_name = normalize_customer_name(name)
+        return name
+
+    def __repr__(self) -> str:
+        return f"<Customer(id={self.id}, name={self.name})>"
@@ -1,19 +1,52 @@
+import enum
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DECIMAL, TIMESTAMP, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DECIMAL, TIMESTAMP, Enum, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models.customer import Customer
+
+
+class InvoiceStatus(enum.StrEnum):
+    """Invoice lifecycle states, stored as the native `invoice_status` Postgres enum."""
+
+    PENDING = "pending"
+    PAID = "paid"
+    CANCELLED = "cancelled"
+    OVERDUE = "overdue"
+
+
+# Statuses that still need attention; covered by the partial indexes below
+OPEN_INVOICE_STATUSES = (InvoiceStatus.PENDING, InvoiceStatus.OVERDUE)
+
+# Target status -> statuses an invoice may be moved from; paid and cancelled are final
+ALLOWED_STATUS_SOURCES: dict[InvoiceStatus, tuple[InvoiceStatus, ...]] = {
+    InvoiceStatus.PENDING: (),
+    InvoiceStatus.OVERDUE: (InvoiceStatus.PENDING,),
+    InvoiceStatus.PAID: OPEN_INVOICE_STATUSES,
+    InvoiceStatus.CANCELLED: OPEN_INVOICE_STATUSES,
+}
+
+invoice_status_enum = Enum(
+    InvoiceStatus,
+    name="invoice_status",
+    values_callable=lambda statuses: [status.value for status in statuses],
+    validate_strings=True,
+)
 
 
 class Invoice(Base):
     __tablename__ = "invoices"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    customer: Mapped[str] = mapped_column(String(255), nullable=False)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"), nullable=False)
+    customer: Mapped[Customer] = relationship(lazy="joined", innerjoin=True)
     amount: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending")
+    status: Mapped[InvoiceStatus] = mapped_column(
+        invoice_status_enum, nullable=False, default=InvoiceStatus.PENDING
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
     )
@@ -21,5 +54,25 @@ class Invoice(Base):
         TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    __table_args__ = (
+        Index("ix_invoices_customer_id_created_at", customer_id, created_at.desc()),
+        # Covering index: sparse invoice lists of these columns can be served by index-only scans
+        Index(
+            "ix_invoices_created_at_covering",
+            created_at.desc(),
+            postgresql_include=["id", "amount", "status"],
+        ),
+        Index(
+            "ix_invoices_pending_created_at",
+            created_at,
+            postgresql_where=status == InvoiceStatus.PENDING,
+        ),
+        Index(
+            "ix_invoices_overdue_created_at",
+            created_at,
+            postgresql_where=status == InvoiceStatus.OVERDUE,
+        ),
+    )
+
     def __repr__(self) -> str:
-        return f"<Invoice(id={self.id}, customer={self.customer}, amount={self.amount}, status={self.status})>"
+        return f"<Invoice(id={self.id}, customer_id={self.customer_id}, amount={self.amount}, status={self.status})>"
@@ -1,7 +1,11 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.models.customer import Customer
+from app.models.invoice import InvoiceStatus
 
 
 class InvoiceCreate(BaseModel):
@@ -9,11 +13,7 @@ class InvoiceCreate(BaseModel):
 
     customer: str = Field(..., min_length=1, max_length=255, description="Customer name")
     amount: Decimal = Field(..., gt=0, description="Invoice amount")
-    status: str = Field(
-        default="pending",
-        pattern="^(pending|paid|cancelled|overdue)$",
-        description="Invoice status",
-    )
+    status: InvoiceStatus = Field(default=InvoiceStatus.PENDING, description="Invoice status")
 
 
 class InvoiceResponse(BaseModel):
@@ -22,8 +22,61 @@ class InvoiceResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+    customer_id: int
     customer: str
     amount: Decimal
-    status: str
+    status: InvoiceStatus
     created_at: datetime
     updated_at: datetime
+
+    @field_validator("customer", mode="before")
+    @classmethod
+    def customer_name(cls, value: Any) -> Any:
+        # ORM invoices carry the related Customer; RETURNING rows carry the name
+        if isinstance(value, Customer):
+            return value.name
+        return value
+
+
+class InvoiceStatusFilter(BaseModel):
+    """Criteria selecting invoices for a bulk status change"""
+
+    status: InvoiceStatus | None = Field(default=None, description="Current invoice status")
+    customer: str | None = Field(default=None, min_length=1, max_length=255)
+    created_before: datetime | None = Field(default=None, description="Created before this time")
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "InvoiceStatusFilter":
+        if self.status is None and self.customer is None and self.created_before is None:
+            raise ValueError("filter needs at least one criterion")
+        return self
+
+
+class InvoiceBulkStatusUpdate(BaseModel):
+    """Schema for changing the status of many invoices at once"""
+
+    ids: list[int] | None = Field(default=None, min_length=1, description="Invoice IDs to update")
+    filter: InvoiceStatusFilter | None = Field(default=None, description="Or: invoices to update")
+    status: InvoiceStatus = Field(..., description="Target status")
+
+    @model_validator(mode="after")
+    def check_one_selector(self) -> "InvoiceBulkStatusUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("provide exactly one of 'ids' or 'filter'")
+        return self
+
+
+class InvoiceStatusUpdateError(BaseModel):
+    """Per-invoice failure in a bulk status change, shaped like an API error response"""
+
+    invoice_id: int
+    error: str
+    status_code: int
+    details: dict[str, Any] = Field(default_factory=dict)
+
+
+class InvoiceBulkStatusResponse(BaseModel):
+    """Schema for bulk status change results"""
+
+    updated: list[InvoiceResponse]
+    errors: list[InvoiceStatusUpdateError]
@@ -0,0 +1,136 @@
+"""Background sweeper that moves stale pending invoices to overdue.
+
+Each batch claims up to `batch_size` rows with `FOR UPDATE SKIP LOCKED` and
+updates them in its own short transaction, so any number of sweepers (API
+processes and standalone workers) can run at the same time without blocking
+each other or holding locks on the invoices table for long.
+
+Standalone usage (from backend/):
+    python -m app.workers.overdue_sweeper          # run forever
+    python -m app.workers.overdue_sweeper --once   # single sweep, then exit
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.db.session import async_session_maker
+from app.logging_config import get_logger, setup_logging
+from app.models.invoice import Invoice, InvoiceStatus
+
+logger = get_logger(__name__)
+
+
+async def sweep_overdue_batch(db: AsyncSession, overdue_after: timedelta, batch_size: int) -> int:
+    """
+    Mark one batch of stale pending invoices as overdue and commit.
+
+    Args:
+        db: Database session
+        overdue_after: Age after which a pending invoice becomes overdue
+        batch_size: Maximum number of invoices to update
+
+    Returns:
+        Number of invoices moved to overdue
+    """
+    claimed_ids = (
+        select(Invoice.id)
+        .where(
+            Invoice.status == InvoiceStatus.PENDING,
+            Invoice.created_at < func.now() - overdue_after,
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(Invoice)
+        .where(Invoice.id.in_(claimed_ids.scalar_subquery()))
+        .values(status=InvoiceStatus.OVERDUE, updated_at=func.now())
+        .returning(Invoice.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = len(result.scalars().all())
+    await db.commit()
+    return updated
+
+
+async def sweep_overdue_invoices(
+    session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+    overdue_after: timedelta | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """
+    Run batches until no stale pending invoices are left unclaimed.
+
+    Args:
+        session_maker: Factory for the per-batch sessions
+        overdue_after: Defaults to OVERDUE_AFTER_DAYS
+        batch_size: Defaults to OVERDUE_SWEEP_BATCH_SIZE
+
+    Returns:
+        Total number of invoices moved to overdue
+    """
+    if overdue_after is None:
+        overdue_after = timedelta(days=settings.OVERDUE_AFTER_DAYS)
+    if batch_size is None:
+        batch_size = settings.OVERDUE_SWEEP_BATCH_SIZE
+
+    total = 0
+    while True:
+        async with session_maker() as session:
+            updated = await sweep_overdue_batch(session, overdue_after, batch_size)
+        total += updated
+        # A short batch means the rest is either done or claimed by another sweeper
+        if updated < batch_size:
+            break
+
+    if total:
+        logger.info(f"Marked {total} invoices as overdue")
+    return total
+
+
+async def run_overdue_sweeper(interval_seconds: int | None = None) -> None:
+    """
+    Sweep forever, sleeping `interval_seconds` between runs.
+
+    Errors (including the database being unreachable) are logged and retried
+    on the next run rather than stopping the loop.
+    """
+    if interval_seconds is None:
+        interval_seconds = settings.OVERDUE_SWEEP_INTERVAL_SECONDS
+
+    logger.info(
+        f"Overdue sweeper started - after: {settings.OVERDUE_AFTER_DAYS}d | "
+        f"batch: {settings.OVERDUE_SWEEP_BATCH_SIZE} | interval: {interval_seconds}s"
+    )
+    while True:
+        try:
+            await sweep_overdue_invoices()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while sweeping overdue invoices: {str(e)}", exc_info=True)
+        except Exception as e:
+            logger.error(
+                f"Unexpected error while sweeping overdue invoices: {str(e)}", exc_info=True
+            )
+        await asyncio.sleep(interval_seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move stale pending invoices to overdue")
+    parser.add_argument("--once", action="store_true", help="Run a single sweep and exit")
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.once:
+        asyncio.run(sweep_overdue_invoices())
+    else:
+        asyncio.run(run_overdue_sweeper())
+
+
+if __name__ == "__main__":
+    main()
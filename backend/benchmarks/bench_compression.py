@@ -0,0 +1,79 @@
+"""Benchmark: CPU cost vs bytes saved for response compression of invoice lists.
+
+Serializes invoice lists of typical sizes exactly as GET /api/v1/invoices/
+does and compresses them with every encoding CompressionMiddleware supports
+here, at a few levels around the configured defaults.
+
+Usage (from backend/, no database needed):
+    python -m benchmarks.bench_compression --sizes 10 100 1000 10000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.middleware.compression import available_encodings, new_compressor
+from app.models.invoice import InvoiceStatus
+from app.schemas.invoice import InvoiceResponse
+
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 9], "zstd": [1, 3, 10]}
+
+
+def invoice_list_body(size: int) -> bytes:
+    rng = random.Random(size)
+    now = datetime.now(UTC)
+    invoices = [
+        InvoiceResponse(
+            id=i,
+            customer=f"Customer {rng.randint(1, 500)}",
+            amount=Decimal(rng.randint(100, 1_000_000)) / 100,
+            status=rng.choice(list(InvoiceStatus)),
+            created_at=now - timedelta(minutes=rng.randint(0, 500_000)),
+            updated_at=now,
+        )
+        for i in range(size)
+    ]
+    return JSONResponse(jsonable_encoder(invoices)).body
+
+
+def compress_cpu_ms(encoding: str, level: int, body: bytes, iterations: int) -> tuple[int, float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.process_time()
+        compressor = new_compressor(encoding, level)
+        compressed = compressor.compress(body) + compressor.finish()
+        timings.append((time.process_time() - start) * 1000)
+    return len(compressed), statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'invoices':>9}{'raw KB':>10}{'encoding':>10}{'level':>7}"
+        f"{'out KB':>10}{'saved %':>9}{'cpu ms':>9}{'KB saved/ms':>13}"
+    )
+    for size in args.sizes:
+        body = invoice_list_body(size)
+        for encoding in available_encodings():
+            for level in LEVELS[encoding]:
+                compressed_size, cpu_ms = compress_cpu_ms(encoding, level, body, args.iterations)
+                saved = len(body) - compressed_size
+                print(
+                    f"{size:>9}{len(body) / 1024:>10.1f}{encoding:>10}{level:>7}"
+                    f"{compressed_size / 1024:>10.1f}{saved / len(body) * 100:>9.1f}"
+                    f"{cpu_ms:>9.2f}{saved / 1024 / max(cpu_ms, 1e-3):>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
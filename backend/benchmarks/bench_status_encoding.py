@@ -0,0 +1,145 @@
+"""Benchmark: text status column vs native enum with open-status partial indexes.
+
+Builds two scratch copies of the invoices table in a throwaway schema, one as
+the baseline schema had it (`VARCHAR(50)` status, no status index), one with
+the `invoice_status` enum and the partial indexes from the model, then reports
+heap/index sizes and open-invoice query latency for both. The enum type is
+created inside the scratch schema, so nothing outside it is touched.
+
+Usage (from backend/, against the database configured in ../.env):
+    python -m benchmarks.bench_status_encoding --rows 1000000 --open-ratio 0.1
+"""
+
+import argparse
+import statistics
+import time
+
+import psycopg2
+
+from app.config import settings
+
+SCHEMA = "bench_status_encoding"
+
+LAYOUTS = {
+    "text": {
+        "status_type": "VARCHAR(50)",
+        "indexes": [],
+    },
+    "enum": {
+        "status_type": f"{SCHEMA}.invoice_status",
+        "indexes": [
+            "CREATE INDEX ON {table} (created_at) WHERE status = 'pending'",
+            "CREATE INDEX ON {table} (created_at) WHERE status = 'overdue'",
+        ],
+    },
+}
+
+OPEN_INVOICES_QUERY = (
+    "SELECT id, customer, amount, status, created_at FROM {table} "
+    "WHERE status = 'pending' ORDER BY created_at DESC LIMIT 100"
+)
+STALE_PENDING_QUERY = (
+    "SELECT count(*) FROM {table} "
+    "WHERE status = 'pending' AND created_at < now() - interval '30 days'"
+)
+
+
+def build_table(cur, layout: str, rows: int, open_ratio: float) -> str:
+    table = f"{SCHEMA}.invoices_{layout}"
+    spec = LAYOUTS[layout]
+    cur.execute(f"""
+        CREATE TABLE {table} (
+            id SERIAL PRIMARY KEY,
+            customer VARCHAR(255) NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            status {spec["status_type"]} NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL
+        )
+        """)
+    # Open invoices split evenly between pending and overdue, the rest paid/cancelled
+    cur.execute(
+        f"""
+        INSERT INTO {table} (customer, amount, status, created_at, updated_at)
+        SELECT
+            'Customer ' || (g % 5000),
+            round((random() * 10000)::numeric, 2),
+            (CASE
+                WHEN r < %(open)s / 2 THEN 'pending'
+                WHEN r < %(open)s THEN 'overdue'
+                WHEN r < %(open)s + (1 - %(open)s) / 2 THEN 'paid'
+                ELSE 'cancelled'
+            END)::{spec["status_type"]},
+            now() - (random() * interval '365 days'),
+            now()
+        FROM (SELECT g, random() AS r FROM generate_series(1, %(rows)s) AS g) AS src
+        """,
+        {"rows": rows, "open": open_ratio},
+    )
+    for index_sql in spec["indexes"]:
+        cur.execute(index_sql.format(table=table))
+    cur.execute(f"VACUUM ANALYZE {table}")
+    return table
+
+
+def table_sizes(cur, table: str) -> tuple[int, int]:
+    cur.execute("SELECT pg_table_size(%s), pg_indexes_size(%s)", (table, table))
+    heap, indexes = cur.fetchone()
+    return heap, indexes
+
+
+def query_latency_ms(cur, sql: str, iterations: int) -> float:
+    cur.execute(sql)  # warm the cache
+    cur.fetchall()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        cur.execute(sql)
+        cur.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--open-ratio", type=float, default=0.1)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(settings.sync_database_url)
+    conn.autocommit = True  # VACUUM cannot run inside a transaction
+    cur = conn.cursor()
+    try:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA}")
+        cur.execute(
+            f"CREATE TYPE {SCHEMA}.invoice_status "
+            "AS ENUM ('pending', 'paid', 'cancelled', 'overdue')"
+        )
+
+        print(f"rows={args.rows} open_ratio={args.open_ratio} iterations={args.iterations}")
+        print(
+            f"{'layout':<8}{'heap MB':>10}{'index MB':>10}{'open p50 ms':>14}{'stale p50 ms':>14}"
+        )
+        for layout in LAYOUTS:
+            table = build_table(cur, layout, args.rows, args.open_ratio)
+            heap, indexes = table_sizes(cur, table)
+            open_ms = query_latency_ms(
+                cur, OPEN_INVOICES_QUERY.format(table=table), args.iterations
+            )
+            stale_ms = query_latency_ms(
+                cur, STALE_PENDING_QUERY.format(table=table), args.iterations
+            )
+            print(
+                f"{layout:<8}{heap / 2**20:>10.1f}{indexes / 2**20:>10.1f}"
+                f"{open_ms:>14.2f}{stale_ms:>14.2f}"
+            )
+    finally:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
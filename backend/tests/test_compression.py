@@ -0,0 +1,129 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.middleware.compression import CompressionMiddleware, choose_encoding
+
+LARGE_PAYLOAD = [{"id": i, "customer": f"Customer {i}", "status": "pending"} for i in range(200)]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, excluded_paths=["/health"])
+
+    @app.get("/large")
+    async def large():
+        return LARGE_PAYLOAD
+
+    @app.get("/small")
+    async def small():
+        return {"status": "ok"}
+
+    @app.get("/health")
+    async def health():
+        return LARGE_PAYLOAD
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(100):
+                yield f'{{"id": {i}, "customer": "Customer {i}"}}\n'.encode()
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson; charset=utf-8")
+
+    @app.get("/precompressed")
+    async def precompressed():
+        body = gzip.compress(b"x" * 2000)
+        return Response(body, media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/binary")
+    async def binary():
+        return Response(b"\x00" * 2000, media_type="application/octet-stream")
+
+    return app
+
+
+@pytest.fixture
+async def compression_client():
+    transport = ASGITransport(app=build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip", "gzip"),
+        ("gzip, br, zstd", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(accept_encoding: str, expected: str | None):
+    assert choose_encoding(accept_encoding, ["br", "zstd", "gzip"]) == expected
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_gzipped(compression_client: AsyncClient):
+    response = await compression_client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == LARGE_PAYLOAD
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("encoding", "module"), [("br", "brotli"), ("zstd", "zstandard")])
+async def test_optional_encodings(compression_client: AsyncClient, encoding: str, module: str):
+    pytest.importorskip(module)
+    response = await compression_client.get("/large", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert response.json() == LARGE_PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_small_response_is_not_compressed(compression_client: AsyncClient):
+    response = await compression_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_excluded_path_is_not_compressed(compression_client: AsyncClient):
+    response = await compression_client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == LARGE_PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_no_accept_encoding_is_not_compressed(compression_client: AsyncClient):
+    response = await compression_client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == LARGE_PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_incrementally(compression_client: AsyncClient):
+    response = await compression_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "".join(
+        f'{{"id": {i}, "customer": "Customer {i}"}}\n' for i in range(100)
+    )
+
+
+@pytest.mark.asyncio
+async def test_non_compressible_responses_pass_through(compression_client: AsyncClient):
+    response = await compression_client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = await compression_client.get("/precompressed", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == b"x" * 2000
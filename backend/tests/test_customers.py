@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.customer_lookup import customer_lookup
+from app.models.customer import Customer, normalize_customer_name
+from app.models.invoice import Invoice
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("  ACME   corp ", "acme corp"),
+        ("Acme\tCorp", "acme corp"),
+        ("Acme\t", "acme"),
+        ("\nAcme\r\n Corp\n", "acme corp"),
+        ("acme\x0bcorp\x0c", "acme corp"),
+    ],
+)
+def test_normalize_customer_name_collapses_whitespace(name: str, expected: str):
+    assert normalize_customer_name(name) == expected
+
+
+def test_normalize_customer_name_keeps_non_ascii_whitespace():
+    # Matches the backfill migration, which only treats ASCII whitespace as separators
+    assert normalize_customer_name("Acme\u00a0Corp") == "acme\u00a0corp"
+
+
+def test_normalize_customer_name_lowercases_ascii_only():
+    # Matches the backfill migration's translate(); str.lower() would turn "İ" into two code points
+    assert normalize_customer_name("İSTANBUL Ägypten") == "İstanbul Ägypten"
+    assert len(normalize_customer_name("İ" * 255)) == 255
+
+
+@pytest.mark.asyncio
+async def test_create_invoice_reuses_normalized_customer(
+    client: AsyncClient, db_session: AsyncSession
+):
+    for name in ["Acme Corp", "  acme   CORP "]:
+        response = await client.post(
+            "/api/v1/invoices/", json={"customer": name, "amount": "100.00"}
+        )
+        assert response.status_code == 201
+        assert response.json()["customer"] == "Acme Corp"
+
+    customer_count = await db_session.scalar(select(func.count()).select_from(Customer))
+    assert customer_count == 1
+
+
+@pytest.mark.asyncio
+async def test_create_invoice_after_rolled_back_customer(
+    client: AsyncClient, db_session: AsyncSession
+):
+    # A request cancelled between resolving the customer and committing
+    await customer_lookup.resolve(db_session, "Acme")
+    await db_session.rollback()
+
+    response = await client.post("/api/v1/invoices/", json={"customer": "Acme", "amount": "100.00"})
+    assert response.status_code == 201
+    assert response.json()["customer"] == "Acme"
+
+
+@pytest.mark.asyncio
+async def test_customer_invoices_reachable_from_invoice_response(client: AsyncClient):
+    response = await client.post("/api/v1/invoices/", json={"customer": "Acme", "amount": "100.00"})
+    assert response.status_code == 201
+    customer_id = response.json()["customer_id"]
+
+    response = await client.get("/api/v1/invoices/", params={"fields": "customer_id,customer"})
+    assert response.json() == [{"customer_id": customer_id, "customer": "Acme"}]
+
+    response = await client.get(f"/api/v1/customers/{customer_id}/invoices")
+    assert response.status_code == 200
+    assert [invoice["customer"] for invoice in response.json()] == ["Acme"]
+
+
+@pytest.mark.asyncio
+async def test_get_customer_invoices_paginated(client: AsyncClient, db_session: AsyncSession):
+    acme = Customer(name="Acme")
+    other = Customer(name="Other")
+    for amount in ["100.00", "200.00", "300.00"]:
+        db_session.add(Invoice(customer=acme, amount=Decimal(amount), status="pending"))
+        await db_session.commit()
+    db_session.add(Invoice(customer=other, amount=Decimal("400.00"), status="pending"))
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/customers/{acme.id}/invoices", params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [invoice["amount"] for invoice in first_page] == ["300.00", "200.00"]
+    assert {invoice["customer"] for invoice in first_page} == {"Acme"}
+
+    response = await client.get(
+        f"/api/v1/customers/{acme.id}/invoices", params={"limit": 2, "offset": 2}
+    )
+    assert response.status_code == 200
+    assert [invoice["amount"] for invoice in response.json()] == ["100.00"]
+
+
+@pytest.mark.asyncio
+async def test_get_customer_invoices_empty(client: AsyncClient, db_session: AsyncSession):
+    customer = Customer(name="No Invoices")
+    db_session.add(customer)
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/customers/{customer.id}/invoices")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_customer_invoices_not_found(client: AsyncClient):
+    response = await client.get("/api/v1/customers/999999/invoices")
+    assert response.status_code == 404
+    assert response.json()["error"] == "Customer not found"
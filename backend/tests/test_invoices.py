@@ -1,9 +1,12 @@
+from datetime import UTC, datetime
 from decimal import Decimal
 
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.models.customer import Customer
 from app.models.invoice import Invoice
 
 
@@ -16,8 +19,12 @@ async def test_get_invoices_empty(client: AsyncClient):
 
 @pytest.mark.asyncio
 async def test_get_invoices_with_data(client: AsyncClient, db_session: AsyncSession):
-    invoice1 = Invoice(customer="Customer A", amount=Decimal("100.00"), status="pending")
-    invoice2 = Invoice(customer="Customer B", amount=Decimal("200.50"), status="paid")
+    invoice1 = Invoice(
+        customer=Customer(name="Customer A"), amount=Decimal("100.00"), status="pending"
+    )
+    invoice2 = Invoice(
+        customer=Customer(name="Customer B"), amount=Decimal("200.50"), status="paid"
+    )
     db_session.add_all([invoice1, invoice2])
     await db_session.commit()
 
@@ -104,12 +111,12 @@ async def test_create_invoice_zero_amount(client: AsyncClient):
 
 @pytest.mark.asyncio
 async def test_get_invoices_ordering(client: AsyncClient, db_session: AsyncSession):
-    invoice1 = Invoice(customer="First", amount=Decimal("100.00"), status="pending")
+    invoice1 = Invoice(customer=Customer(name="First"), amount=Decimal("100.00"), status="pending")
     db_session.add(invoice1)
     await db_session.commit()
     await db_session.refresh(invoice1)
 
-    invoice2 = Invoice(customer="Second", amount=Decimal("200.00"), status="pending")
+    invoice2 = Invoice(customer=Customer(name="Second"), amount=Decimal("200.00"), status="pending")
     db_session.add(invoice2)
     await db_session.commit()
 
@@ -118,4 +125,197 @@ async def test_get_invoices_ordering(client: AsyncClient, db_session: AsyncSessi
     data = response.json()
     assert len(data) == 2
     assert data[0]["customer"] == "Second"
-    assert data[1]["customer"] == "First"
\ No newline at end of file
+    assert data[1]["customer"] == "First"
+
+
+@pytest.mark.asyncio
+async def test_get_invoices_filter_by_status(client: AsyncClient, db_session: AsyncSession):
+    db_session.add_all(
+        [
+            Invoice(customer=Customer(name="Open"), amount=Decimal("100.00"), status="pending"),
+            Invoice(customer=Customer(name="Late"), amount=Decimal("150.00"), status="overdue"),
+            Invoice(customer=Customer(name="Settled"), amount=Decimal("200.00"), status="paid"),
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.get("/api/v1/invoices/", params={"status": "overdue"})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["customer"] == "Late"
+    assert data[0]["status"] == "overdue"
+
+
+@pytest.mark.asyncio
+async def test_get_invoices_filter_invalid_status(client: AsyncClient):
+    response = await client.get("/api/v1/invoices/", params={"status": "invalid_status"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_update_by_ids(client: AsyncClient, db_session: AsyncSession):
+    pending = Invoice(customer=Customer(name="Pending"), amount=Decimal("100.00"), status="pending")
+    overdue = Invoice(customer=Customer(name="Overdue"), amount=Decimal("150.00"), status="overdue")
+    cancelled = Invoice(
+        customer=Customer(name="Cancelled"), amount=Decimal("200.00"), status="cancelled"
+    )
+    db_session.add_all([pending, overdue, cancelled])
+    await db_session.commit()
+
+    response = await client.patch(
+        "/api/v1/invoices/status",
+        json={"ids": [pending.id, overdue.id, cancelled.id, 999999], "status": "paid"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert sorted(invoice["id"] for invoice in data["updated"]) == sorted([pending.id, overdue.id])
+    assert all(invoice["status"] == "paid" for invoice in data["updated"])
+
+    errors = {error["invoice_id"]: error for error in data["errors"]}
+    assert errors[cancelled.id]["status_code"] == 400
+    assert errors[cancelled.id]["details"]["current_status"] == "cancelled"
+    assert errors[999999]["status_code"] == 404
+    assert errors[999999]["error"] == "Invoice not found"
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_update_bumps_updated_at(client: AsyncClient, db_session: AsyncSession):
+    invoice = Invoice(
+        customer=Customer(name="Customer"), amount=Decimal("100.00"), status="pending"
+    )
+    db_session.add(invoice)
+    await db_session.commit()
+    previous_updated_at = invoice.updated_at
+
+    response = await client.patch(
+        "/api/v1/invoices/status", json={"ids": [invoice.id], "status": "cancelled"}
+    )
+    assert response.status_code == 200
+    updated = response.json()["updated"][0]
+    assert updated["status"] == "cancelled"
+    assert datetime.fromisoformat(updated["updated_at"]) > previous_updated_at.replace(tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_update_by_filter(client: AsyncClient, db_session: AsyncSession):
+    acme = Customer(name="Acme")
+    db_session.add_all(
+        [
+            Invoice(customer=acme, amount=Decimal("100.00"), status="pending"),
+            Invoice(customer=acme, amount=Decimal("120.00"), status="overdue"),
+            Invoice(customer=Customer(name="Other"), amount=Decimal("130.00"), status="pending"),
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.patch(
+        "/api/v1/invoices/status", json={"filter": {"customer": "Acme"}, "status": "paid"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["updated"]) == 2
+    assert {invoice["customer"] for invoice in data["updated"]} == {"Acme"}
+    assert data["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_update_by_ids_across_chunks(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings, "BULK_STATUS_CHUNK_SIZE", 2)
+    acme = Customer(name="Acme")
+    pending = [Invoice(customer=acme, amount=Decimal("100.00"), status="pending") for _ in range(3)]
+    cancelled = Invoice(customer=acme, amount=Decimal("200.00"), status="cancelled")
+    db_session.add_all([*pending, cancelled])
+    await db_session.commit()
+
+    # Chunks: [pending, cancelled], [pending, missing], [pending]
+    ids = [pending[0].id, cancelled.id, pending[1].id, 999999, pending[2].id]
+    response = await client.patch("/api/v1/invoices/status", json={"ids": ids, "status": "paid"})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert sorted(invoice["id"] for invoice in data["updated"]) == sorted(
+        invoice.id for invoice in pending
+    )
+    assert all(invoice["status"] == "paid" for invoice in data["updated"])
+    errors = {error["invoice_id"]: error["status_code"] for error in data["errors"]}
+    assert errors == {cancelled.id: 400, 999999: 404}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("matching", [3, 4])
+async def test_bulk_status_update_by_filter_across_chunks(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch, matching: int
+):
+    # Both a short and an exactly full last chunk are followed by the empty pass that ends the loop
+    monkeypatch.setattr(settings, "BULK_STATUS_CHUNK_SIZE", 2)
+    acme = Customer(name="Acme")
+    db_session.add_all(
+        [
+            Invoice(customer=acme, amount=Decimal("100.00"), status="pending")
+            for _ in range(matching)
+        ]
+    )
+    db_session.add(Invoice(customer=acme, amount=Decimal("100.00"), status="paid"))
+    await db_session.commit()
+
+    response = await client.patch(
+        "/api/v1/invoices/status", json={"filter": {"status": "pending"}, "status": "overdue"}
+    )
+    assert response.status_code == 200
+    updated_ids = [invoice["id"] for invoice in response.json()["updated"]]
+    assert len(updated_ids) == len(set(updated_ids)) == matching
+
+    response = await client.get("/api/v1/invoices/", params={"status": "pending"})
+    assert response.json() == []
+    response = await client.get("/api/v1/invoices/", params={"status": "paid"})
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_update_requires_one_selector(client: AsyncClient):
+    response = await client.patch("/api/v1/invoices/status", json={"status": "paid"})
+    assert response.status_code == 422
+
+    response = await client.patch(
+        "/api/v1/invoices/status",
+        json={"ids": [1], "filter": {"status": "pending"}, "status": "paid"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_invoices_sparse_fields(client: AsyncClient, db_session: AsyncSession):
+    invoice = Invoice(customer=Customer(name="Sparse"), amount=Decimal("100.00"), status="pending")
+    db_session.add(invoice)
+    await db_session.commit()
+
+    response = await client.get("/api/v1/invoices/", params={"fields": "id,status,amount"})
+    assert response.status_code == 200
+    assert response.json() == [{"id": invoice.id, "status": "pending", "amount": "100.00"}]
+
+
+@pytest.mark.asyncio
+async def test_get_invoices_sparse_fields_with_customer(
+    client: AsyncClient, db_session: AsyncSession
+):
+    db_session.add(Invoice(customer=Customer(name="Sparse"), amount=Decimal("100.00")))
+    await db_session.commit()
+
+    response = await client.get(
+        "/api/v1/invoices/", params={"fields": "customer, status", "status": "pending"}
+    )
+    assert response.status_code == 200
+    assert response.json() == [{"customer": "Sparse", "status": "pending"}]
+
+
+@pytest.mark.asyncio
+async def test_get_invoices_invalid_fields(client: AsyncClient):
+    response = await client.get("/api/v1/invoices/", params={"fields": "id,secret"})
+    assert response.status_code == 400
+    data = response.json()
+    assert data["details"]["invalid_fields"] == ["secret"]
+    assert "amount" in data["details"]["allowed_fields"]
@@ -0,0 +1,125 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.customer import Customer
+from app.models.invoice import Invoice, InvoiceStatus
+from app.workers import overdue_sweeper
+from app.workers.overdue_sweeper import (
+    run_overdue_sweeper,
+    sweep_overdue_batch,
+    sweep_overdue_invoices,
+)
+
+
+def _invoice(customer: str, status: str, age_days: int) -> Invoice:
+    created_at = datetime.now(UTC) - timedelta(days=age_days)
+    return Invoice(
+        customer=Customer(name=customer),
+        amount=Decimal("100.00"),
+        status=status,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sweep_marks_only_stale_pending_invoices(db_engine, db_session: AsyncSession):
+    db_session.add_all(
+        [
+            _invoice("Stale", "pending", age_days=45),
+            _invoice("Fresh", "pending", age_days=5),
+            _invoice("Paid", "paid", age_days=45),
+        ]
+    )
+    await db_session.commit()
+
+    session_maker = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    updated = await sweep_overdue_invoices(
+        session_maker, overdue_after=timedelta(days=30), batch_size=10
+    )
+    assert updated == 1
+
+    async with session_maker() as session:
+        result = await session.execute(
+            select(Customer.name, Invoice.status).select_from(Invoice).join(Invoice.customer)
+        )
+        statuses = dict(result.all())
+    assert statuses == {
+        "Stale": InvoiceStatus.OVERDUE,
+        "Fresh": InvoiceStatus.PENDING,
+        "Paid": InvoiceStatus.PAID,
+    }
+
+
+@pytest.mark.asyncio
+async def test_sweep_runs_in_bounded_batches(db_engine, db_session: AsyncSession):
+    db_session.add_all([_invoice(f"Stale {i}", "pending", age_days=60) for i in range(5)])
+    await db_session.commit()
+
+    session_maker = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        assert await sweep_overdue_batch(session, timedelta(days=30), batch_size=2) == 2
+
+    assert await sweep_overdue_invoices(session_maker, timedelta(days=30), batch_size=2) == 3
+
+
+@pytest.mark.asyncio
+async def test_sweep_skips_rows_locked_by_another_worker(db_engine, db_session: AsyncSession):
+    invoices = [_invoice(f"Stale {i}", "pending", age_days=60) for i in range(4)]
+    db_session.add_all(invoices)
+    await db_session.commit()
+    locked_ids = [invoices[0].id, invoices[1].id]
+
+    session_maker = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as locking_session, session_maker() as sweeping_session:
+        # Another worker holding row locks on two of the stale invoices
+        await locking_session.execute(
+            select(Invoice.id).where(Invoice.id.in_(locked_ids)).with_for_update()
+        )
+
+        swept = await asyncio.wait_for(
+            sweep_overdue_batch(sweeping_session, timedelta(days=30), batch_size=10), timeout=5
+        )
+        assert swept == 2
+        locked_statuses = await locking_session.scalars(
+            select(Invoice.status).where(Invoice.id.in_(locked_ids))
+        )
+        assert set(locked_statuses) == {InvoiceStatus.PENDING}
+
+        await locking_session.rollback()
+        assert await sweep_overdue_batch(sweeping_session, timedelta(days=30), batch_size=10) == 2
+
+    async with session_maker() as session:
+        statuses = (await session.execute(select(Invoice.status))).scalars().all()
+    assert statuses == [InvoiceStatus.OVERDUE] * 4
+
+
+@pytest.mark.asyncio
+async def test_sweeper_loop_survives_unreachable_database(monkeypatch):
+    calls = 0
+    swept_again = asyncio.Event()
+
+    async def flaky_sweep() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise OSError("Connection refused")
+        swept_again.set()
+        return 0
+
+    monkeypatch.setattr(overdue_sweeper, "sweep_overdue_invoices", flaky_sweep)
+
+    task = asyncio.create_task(run_overdue_sweeper(interval_seconds=0))
+    try:
+        await asyncio.wait_for(swept_again.wait(), timeout=5)
+        assert not task.done()
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert calls >= 2
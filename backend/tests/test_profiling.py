@@ -0,0 +1,147 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.api.v1.endpoints import profiles
+from app.config import settings
+from app.exception_handlers import app_exception_handler
+from app.exceptions import AppError
+from app.middleware.logging import RequestLoggingMiddleware
+from app.middleware.profiling import ProfilingMiddleware, profile_store
+
+TOKEN = "test-profiling-token"
+
+
+def build_app(sample_rate: float = 0.0) -> FastAPI:
+    app = FastAPI()
+    app.add_exception_handler(AppError, app_exception_handler)  # type: ignore[arg-type]
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        sample_rate=sample_rate,
+        excluded_prefixes=("/profiles",),
+    )
+    app.add_middleware(RequestLoggingMiddleware)
+    app.include_router(profiles.router, prefix="/profiles")
+
+    engine = create_engine("sqlite://")
+
+    @app.get("/work")
+    async def work():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {"status": "ok"}
+
+    return app
+
+
+@pytest.fixture(autouse=True)
+def profiling_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", TOKEN)
+    monkeypatch.setattr(profile_store, "directory", tmp_path)
+    monkeypatch.setattr(profile_store, "max_profiles", 2)
+
+
+async def request(app: FastAPI, path: str, headers: dict[str, str] | None = None):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_request_with_token_is_profiled():
+    app = build_app()
+    response = await request(app, "/work", headers={"X-Profile-Token": TOKEN})
+    request_id = response.headers["X-Request-ID"]
+
+    response = await request(app, f"/profiles/{request_id}", headers={"X-Profile-Token": TOKEN})
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile["path"] == "/work"
+    assert profile["status_code"] == 200
+    assert [query["statement"] for query in profile["queries"]] == ["SELECT 1"]
+    assert profile["functions"]
+
+    response = await request(
+        app, f"/profiles/{request_id}/pstats", headers={"X-Profile-Token": TOKEN}
+    )
+    assert response.status_code == 200
+    assert response.content
+
+
+@pytest.mark.asyncio
+async def test_request_without_valid_token_is_not_profiled():
+    app = build_app()
+    await request(app, "/work")
+    await request(app, "/work", headers={"X-Profile-Token": "wrong"})
+    assert profile_store.recent() == []
+
+
+@pytest.mark.asyncio
+async def test_sampled_requests_are_profiled_in_bounded_ring_buffer():
+    app = build_app(sample_rate=1.0)
+    request_ids = [(await request(app, "/work")).headers["X-Request-ID"] for _ in range(3)]
+
+    stored = [profile["request_id"] for profile in profile_store.recent()]
+    assert len(stored) == 2
+    assert request_ids[0] not in stored
+    assert profile_store.load(request_ids[0]) is None
+
+
+@pytest.mark.asyncio
+async def test_profiles_removed_concurrently_are_skipped(tmp_path):
+    app = build_app(sample_rate=1.0)
+    request_id = (await request(app, "/work")).headers["X-Request-ID"]
+    # Stands in for a summary evicted between listing and reading it
+    (tmp_path / f"{uuid.uuid4()}.json").symlink_to(tmp_path / "evicted.json")
+    # A summary still being written is not listed until renamed into place
+    (tmp_path / f"{uuid.uuid4()}.json.tmp").write_text('{"request_id": ')
+
+    assert [profile["request_id"] for profile in profile_store.recent()] == [request_id]
+    response = await request(app, "/profiles/", headers={"X-Profile-Token": TOKEN})
+    assert response.status_code == 200
+    assert [profile["request_id"] for profile in response.json()] == [request_id]
+
+    await request(app, "/work")
+    assert len(profile_store.recent()) == 2
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoints_require_token():
+    app = build_app()
+    response = await request(app, "/profiles/")
+    assert response.status_code == 403
+
+    response = await request(app, "/profiles/", headers={"X-Profile-Token": "wrong"})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_unknown_profile_is_not_found():
+    app = build_app()
+    for request_id in ["00000000-0000-0000-0000-000000000000", "..%2Fsecrets"]:
+        response = await request(app, f"/profiles/{request_id}", headers={"X-Profile-Token": TOKEN})
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_app_error_propagates_when_storing_profile_fails(monkeypatch):
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("app failed")
+
+    def failing_save(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(profile_store, "save", failing_save)
+    middleware = ProfilingMiddleware(failing_app, store=profile_store, sample_rate=1.0)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/work",
+        "headers": [],
+        "state": {"request_id": str(uuid.uuid4())},
+    }
+    with pytest.raises(RuntimeError, match="app failed"):
+        await middleware(scope, None, None)
@@ -13,6 +13,7 @@ const API_BASE_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
 
 interface Invoice {
   id: number;
+  customer_id: number;
   customer: string;
   amount: string;  // API returns amount as string
   status: string;